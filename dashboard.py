@@ -1,8 +1,124 @@
 import streamlit as st
+import altair as alt
 import pandas as pd
 import numpy as np
-import json
+import pyarrow as pa
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+    import json
+
+
+# Columns shown with top_table, in display order
+TOP_TABLE_COLUMNS = (
+    "haste_potion", "destruction_potion", "spell_elixir_of_demonslaying", "mana_potion",
+    "super_sapper_charge", "goblin_sapper_charge", "spell_arcane_bomb", "spell_feladabomb",
+    "spell_sunder_armor", "spell_demoralizing_shout", "spell_thunder_clap", "spell_shouts",
+    "spell_faerie_fire", "spell_insect_swarm", "spell_innervate", "spell_natures_swiftnessd",
+    "spell_curse_of_the_elements", "spell_curse_of_recklessness", "spell_curse_of_doom",
+    "spell_curse_of_agony", "spell_curse_of_tongues", "spell_shadow_vulnerability",
+    "spell_bloodlust", "spell_mana_tide_totem", "spell_natures_swiftness",
+    "spell_braided_eternium_chain", "spell_chain_of_the_twilight_owl", "spell_eye_of_the_night",
+    "spell_fortitude", "spell_intellect", "spell_mark_of_the_wild", "spell_dispels",
+    "spell_scroll_of_strength", "spell_scroll_of_agility", "spell_demonicdark_rune",
+    "spell_nightmare_seed", "spell_resurrects", "spell_interrupts", "spell_drums",
+    "spell_annihilator", "spell_misdirection",
+)
+TOP_TABLE_ROWS = 20
+
+# Every numeric report column the dashboard reads; all but dps/hps are counters
+METRIC_COLUMNS = ("dps", "hps", *TOP_TABLE_COLUMNS)
+METRIC_DTYPES = {
+    **{col: "int32[pyarrow]" for col in METRIC_COLUMNS},
+    "dps": "float[pyarrow]",
+    "hps": "float[pyarrow]",
+}
+
+
+@st.cache_resource(ttl=60, show_spinner=False)
+def list_reports():
+    # Shared across sessions; the TTL lets newly added reports show up
+    report_paths = sorted(Path("reports").rglob("report.json"), reverse=True)
+    return {str(path.parent.name): str(path) for path in report_paths}
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def load_report(path_str, mtime):
+    # mtime is only part of the cache key, so edited reports get reparsed
+    with open(path_str, "rb") as f:
+        data = f.read()
+    report = orjson.loads(data) if orjson else json.loads(data)
+
+    # Keys a report doesn't have (e.g. potions in older reports) come in as NaN
+    players = pd.DataFrame(report.get("players", []), columns=["name", *METRIC_COLUMNS])
+    players = players[players["name"].ne("Total")].fillna({col: 0 for col in METRIC_COLUMNS})
+
+    # Sums, comparisons and top-n don't need 64-bit precision. Arrow-backed
+    # columns are also handed to st.dataframe without a NumPy -> Arrow conversion
+    return (
+        players.astype({"name": "string[pyarrow]", **METRIC_DTYPES})
+        .assign(report_name=Path(path_str).parent.name)
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_df(selected, aggregate):
+    # selected holds (path, mtime) pairs, so editing any report invalidates the entry
+    # Load uncached reports concurrently so their file reads overlap
+    frames, errors = [], []
+    with ThreadPoolExecutor(max_workers=min(16, len(selected)) or 1) as executor:
+        futures = [(path_str, executor.submit(load_report, path_str, mtime)) for path_str, mtime in selected]
+        for path_str, future in futures:
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                errors.append(f"Could not load {path_str}: {e}")
+
+    df_all = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if df_all.empty or not aggregate:
+        return df_all, errors
+
+    # Categorical keys let groupby work on integer codes instead of hashing strings
+    df_all = df_all.astype({'name': 'category', 'report_name': 'category'})
+
+    # Group by player name and sum numeric values
+    sums = df_all.groupby('name', sort=False, observed=True)[list(METRIC_COLUMNS)].sum()
+
+    # Combine report names, joining at most one string per report for each player
+    report_names = (
+        df_all[['name', 'report_name']]
+        .drop_duplicates()
+        .groupby('name', sort=False, observed=True)['report_name']
+        .agg(lambda x: ', '.join(sorted(x)))
+    )
+    return sums.join(report_names).reset_index(), errors
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_tops(selected, aggregate):
+    df, _ = build_df(selected, aggregate)
+
+    # One long-form pass ranks every top table metric at once
+    long = df.melt(id_vars='name', value_vars=list(TOP_TABLE_COLUMNS), var_name='metric')
+    long = long[long['value'] > 0]  # Filter out zero values
+    tops = (
+        long.sort_values(['metric', 'value'], ascending=[True, False], kind='stable')
+        .groupby('metric', sort=False)
+        .head(TOP_TABLE_ROWS)
+        .astype({'name': 'string[pyarrow]'})
+    )
+
+    # Each metric is a contiguous run of rows, so top_table can slice it out
+    sizes = tops.groupby('metric', sort=False).size()
+    offsets = {
+        metric: (start, size)
+        for metric, start, size in zip(sizes.index, sizes.cumsum() - sizes, sizes)
+    }
+    return pa.Table.from_pandas(tops[['name', 'value']], preserve_index=False), offsets
 
 
 st.set_page_config(layout="wide")
@@ -17,9 +133,12 @@ selection_mode = st.radio(
 )
 
 # Reports selection
-report_paths = sorted(Path("reports").rglob("report.json"), reverse=True)
-clean_report_names = [str(path.parent.name) for path in report_paths]
-name_to_path = {str(path.parent.name): str(path) for path in report_paths}
+name_to_path = list_reports()
+clean_report_names = list(name_to_path)
+
+if not clean_report_names:
+    st.error("No valid report data found.")
+    st.stop()
 
 if selection_mode == "Single Report":
     selected_report = st.selectbox("Select a report:", clean_report_names, index=0)
@@ -36,65 +155,48 @@ elif selection_mode == "Multiple Reports":
 else:  # All Reports
     selected_reports = clean_report_names
 
-# Iterate and combine data from selected reports only
-all_players = []
-for path in report_paths:
-    report_name = str(path.parent.name)
-    if report_name in selected_reports:  # Only load selected reports
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                report = json.load(f)
-            players = report.get("players", [])
-            for player in players:
-                if player["name"] != "Total":
-                    player["report_name"] = report_name
-                    all_players.append(player)
-        except Exception as e:
-            st.warning(f"Could not load {path}: {e}")
-
-df_all = pd.DataFrame(all_players)
-
-# Load data based on selection
-if selection_mode == "Single Report":
-    if df_all.empty:
-        st.error("No valid report data found.")
-        st.stop()
-    df = df_all.copy()
-else:
-    if df_all.empty:
-        st.error("No valid report data found.")
-        st.stop()
-    
-    # Aggregate numeric columns by player name
-    numeric_columns = df_all.select_dtypes(include=[np.number]).columns.tolist()
-    
-    # Group by player name and sum numeric values
-    df_aggregated = df_all.groupby('name').agg({
-        **{col: 'sum' for col in numeric_columns},
-        'report_name': lambda x: ', '.join(sorted(set(x)))  # Combine report names
-    }).reset_index()
+# Combine data from selected reports only
+selected = []
+for name in selected_reports:
+    path = name_to_path[name]
+    try:
+        selected.append((path, Path(path).stat().st_mtime))
+    except OSError as e:  # Removed since the report index was cached
+        st.warning(f"Could not load {path}: {e}")
+        list_reports.clear()
+selected = tuple(sorted(selected))
+aggregate = selection_mode != "Single Report"
+df, load_errors = build_df(selected, aggregate)
+for error in load_errors:
+    st.warning(error)
+
+if df.empty:
+    st.error("No valid report data found.")
+    st.stop()
+
+tops, tops_offsets = build_tops(selected, aggregate)
 
-    # Keep any non-numeric columns from the first occurrence
-    non_numeric_cols = [col for col in df_all.columns if col not in numeric_columns + ['name', 'report_name']]
-    if non_numeric_cols:
-        first_occurrence = df_all.groupby('name')[non_numeric_cols].first().reset_index()
-        df = df_aggregated.merge(first_occurrence, on='name', how='left')
-    else:
-        df = df_aggregated
+
+def top_rows(column, n):
+    values = df[column].to_numpy()
+    idx = np.flatnonzero(values > 0)  # Filter out zero values
+    # Partition out the n largest values and only sort those
+    if idx.size > n:
+        idx = idx[np.argpartition(-values[idx], n)[:n]]
+    idx = idx[np.argsort(-values[idx], kind="stable")]
+    return df.iloc[idx][["name", column]]
 
 
 # Create top tables
-def top_table(title, column, n=20, column_display_name="used"):
+def top_table(title, column, n=TOP_TABLE_ROWS, column_display_name="used"):
     st.markdown(f"**{title}**")
-    sorted_df = (
-        df[["name", column]]
-        .query(f"{column} > 0")  # Filter out zero values
-        .sort_values(by=column, ascending=False)
-        .head(n)
-    )
-    # Rename column if display name provided
-    if column_display_name:
-        sorted_df = sorted_df.rename(columns={column: column_display_name})
+    if column not in TOP_TABLE_COLUMNS:
+        raise KeyError(f"{column!r} is missing from TOP_TABLE_COLUMNS")
+    # Metrics without any positive values have no rows in tops
+    start, size = tops_offsets.get(column, (0, 0))
+    sorted_df = tops.slice(start, min(n, size))
+    # Rename column to display name if provided
+    sorted_df = sorted_df.rename_columns(["name", column_display_name or column])
     
     st.dataframe(sorted_df, use_container_width=True, hide_index=True)
 
@@ -102,17 +204,14 @@ def top_table(title, column, n=20, column_display_name="used"):
 
 def bar_chart(title, column, n=10):
     st.subheader(title)
-    chart_data = (
-        df[["name", column]]
-        .query(f"{column} > 0")  # Filter out zero values
-        .sort_values(by=column, ascending=False)
-        .head(n)
+    chart_data = top_rows(column, n)
+
+    # Sort bars by value on the x axis to keep the ranking order
+    chart = alt.Chart(chart_data).mark_bar().encode(
+        x=alt.X("name", type="nominal", sort="-y", title=None),
+        y=alt.Y(column, type="quantitative"),
     )
-    
-    # Add invisible ranking characters (spaces) to maintain order
-    chart_data['ranked_name'] = [f"{' ' * (n-i)}{name}" for i, name in enumerate(chart_data['name'])]
-    chart_data = chart_data.set_index('ranked_name')[column]
-    st.bar_chart(chart_data)
+    st.altair_chart(chart, width="stretch")
 
 # === DPS / HPS Bar Charts ===
 col1, col2 = st.columns(2)